@@ -1,66 +1,536 @@
 #!/usr/bin/env python3
-import time
 import os
+import re
+import atexit
+import asyncio
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
 import requests
 import json
+import orjson
 import argparse
 import sys
-import random
+import urllib3
 import undetected_chromedriver as uc
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from selenium_stealth import stealth
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
 
 
-def scrape_ozon_product(url, verbose=False, show_window=False):
+# All the fields the scraper knows how to collect
+ALL_FIELDS = ("name", "description", "price", "price_currency", "characteristics", "image_urls")
+
+# Fields that can be served from JSON-LD alone, without launching a browser
+FAST_FIELDS = ("name", "description", "price", "price_currency")
+
+# Only the subtrees we actually read get parsed into the soup; the parser
+# skips the rest of the (very large) page
+LDJSON_STRAINER = SoupStrainer("script", attrs={"type": "application/ld+json"})
+CHARACTERISTICS_STRAINER = SoupStrainer(id="section-characteristics")
+
+# One C-level scan over the raw HTML finds the JSON-LD payload without
+# building any tree at all; the strained soup parse is kept as a fallback
+LDJSON_RE = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script>', re.DOTALL)
+
+# Selectors compiled once at import so batch scrapes don't re-parse the
+# selector strings on every page
+LDJSON_SELECTOR = sv.compile('script[type="application/ld+json"]')
+CHARACTERISTICS_SELECTOR = sv.compile("#section-characteristics")
+CHARACTERISTIC_NAME_SELECTOR = sv.compile("dl dt")
+CHARACTERISTIC_VALUE_SELECTOR = sv.compile("dl dd")
+
+# We only ever read image URLs out of the DOM, never the pixels, so there
+# is no reason to download them. CSS is deliberately not blocked: the
+# gallery thumbnails must stay laid out and clickable.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.webp",
+    "*.gif",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.mp4",
+    "*/analytics/*",
+]
+
+FAST_PATH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9",
+}
+
+
+def _is_product_schema(json_data):
+    """
+    Returns True if the JSON-LD payload is a schema.org Product block.
+    `@type` may be a single string or a list of types.
+    """
+    schema_type = json_data.get("@type")
+    if isinstance(schema_type, list):
+        return "Product" in schema_type
+    return schema_type == "Product"
+
+
+def parse_json_ld(page_source, verbose=False):
+    """
+    Extracts name, description, and price information from the JSON-LD
+    script tag of an Ozon product page. The tag is located with a single
+    regex scan over the raw HTML - no tree is built at all - with a
+    strained BeautifulSoup parse as fallback if the regex misses.
+    Returns a dict (possibly empty).
+    """
+    data = {}
+    candidates = [match.group(1) for match in LDJSON_RE.finditer(page_source)]
+    if not candidates:
+        soup = BeautifulSoup(page_source, "lxml", parse_only=LDJSON_STRAINER)
+        candidates = [tag.string for tag in LDJSON_SELECTOR.select(soup) if tag.string]
+
+    if not candidates:
+        if verbose:
+            print("!!! Could not find JSON-LD script tag. Name, description, and price will be missing.", file=sys.stderr)
+        return data
+
+    # Pages carry several JSON-LD blocks (breadcrumbs, organization, ...);
+    # take the first one that decodes and validates as a Product
+    json_data = None
+    for raw_json in candidates:
+        try:
+            parsed = json.loads(raw_json)
+        except ValueError:
+            # The non-greedy regex truncates payloads that contain
+            # "</script>" inside a JSON string - treat them as misses
+            continue
+        if _is_product_schema(parsed):
+            json_data = parsed
+            break
+
+    if json_data is None:
+        if verbose:
+            print("- No JSON-LD block is a Product schema. Name, description, and price will be missing.", file=sys.stderr)
+        return data
+
+    if verbose:
+        print("Found Product JSON-LD script. Extracting name, description, and price.", file=sys.stderr)
+    name = json_data.get("name")
+    if name:
+        data["name"] = name
+    description = json_data.get("description")
+    if description:
+        data["description"] = description.replace("\n\n", " ")
+    offers = json_data.get("offers", [])
+    if isinstance(offers, list) and offers:
+        data["price"] = offers[0].get("price")
+        data["price_currency"] = offers[0].get("priceCurrency")
+    elif isinstance(offers, dict):
+        data["price"] = offers.get("price")
+        data["price_currency"] = offers.get("priceCurrency")
+    return data
+
+
+def parse_characteristics(soup, verbose=False):
+    """
+    Parses the characteristics section out of the page HTML. Ozon renders
+    each characteristic as a <dt> (name) / <dd> (value) pair inside the
+    section's definition lists. Returns a list of {name, value} dicts.
+    """
+    section = CHARACTERISTICS_SELECTOR.select_one(soup)
+    if section is None:
+        if verbose:
+            print("- Characteristics section not found in page HTML.", file=sys.stderr)
+        return []
+
+    characteristics = []
+    for dt, dd in zip(CHARACTERISTIC_NAME_SELECTOR.select(section), CHARACTERISTIC_VALUE_SELECTOR.select(section)):
+        name = dt.get_text(" ", strip=True)
+        value = dd.get_text(" ", strip=True)
+        if name:
+            characteristics.append({"name": name, "value": value})
+    return characteristics
+
+
+def try_fast_path(url, verbose=False):
+    """
+    Fetches the page with plain requests and extracts JSON-LD data,
+    avoiding the cost of launching a browser. Returns the extracted dict,
+    or None if the page was blocked or contained no JSON-LD.
+    """
+    if verbose:
+        print("Trying fast path (requests + JSON-LD, no browser)...", file=sys.stderr)
+    try:
+        response = requests.get(url, headers=FAST_PATH_HEADERS, timeout=15)
+    except requests.RequestException as e:
+        if verbose:
+            print(f"- Fast path request failed: {e}", file=sys.stderr)
+        return None
+
+    if response.status_code != 200:
+        if verbose:
+            print(f"- Fast path got HTTP {response.status_code} (likely anti-bot). Falling back to Selenium.", file=sys.stderr)
+        return None
+
+    data = parse_json_ld(response.text, verbose=verbose)
+    if not data:
+        return None
+    if verbose:
+        print("- Fast path succeeded.", file=sys.stderr)
+    return data
+
+
+# Cached driver reused across scrape calls (see get_driver)
+_DRIVER = None
+
+PROFILE_DIR = os.path.expanduser("~/.cache/ozon-scraper-profile")
+
+
+def _profile_locked(profile):
+    """
+    Returns True if a live Chrome currently holds this profile's singleton
+    lock. Chrome leaves a SingletonLock symlink pointing at hostname-pid;
+    a stale link from a dead process does not count as locked.
+    """
+    try:
+        target = os.readlink(os.path.join(profile, "SingletonLock"))
+    except OSError:
+        return False
+    _, _, pid = target.rpartition("-")
+    if not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except OSError:
+        return False
+    return True
+
+
+def _profile_dir():
+    """
+    Returns the persistent Chrome profile directory for this process.
+    Chrome locks the profile while running, so each pool worker gets its
+    own directory (still stable across runs for the same worker count),
+    and a concurrent CLI invocation that finds the profile already locked
+    falls back to a throwaway per-PID directory rather than failing to
+    launch.
+    """
+    process = multiprocessing.current_process()
+    if process.name != "MainProcess":
+        profile = f"{PROFILE_DIR}-{process.name}"
+    else:
+        profile = PROFILE_DIR
+    if _profile_locked(profile):
+        return os.path.join(tempfile.gettempdir(), f"ozon-scraper-profile-{os.getpid()}")
+    return profile
+
+
+def _create_driver(show_window=False):
+    """
+    Creates a new undetected Chrome driver with the anti-bot options applied.
+    """
+    options = Options()
+    # Return from driver.get at DOMContentLoaded instead of waiting for
+    # every subresource; the explicit waits below cover the rest
+    options.page_load_strategy = "eager"
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+
+    # Reuse one profile across runs so cached DNS, HSTS, the HTTP cache,
+    # and cookies survive Chrome restarts instead of being rebuilt in a
+    # fresh temporary directory every time
+    options.add_argument(f"--user-data-dir={_profile_dir()}")
+    options.add_argument("--disk-cache-size=104857600")  # cap the cache at 100 MB
+
+    if not show_window:
+        options.add_argument("--headless")
+        options.add_argument("--window-size=1200,700")
+
+    driver = uc.Chrome(options=options, version_main=142)
+
+    # undetected_chromedriver already patches the usual CDP fingerprints,
+    # so the selenium-stealth wrapper (half a dozen CDP round-trips per
+    # driver init) is redundant; the only fix still needed is the locale,
+    # applied in a single call
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": "Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru']});"},
+    )
+
+    # Stop Chrome from downloading images, fonts, and media - we only need
+    # the HTML and the src attributes, so page loads shrink from multi-MB
+    # to a few hundred KB
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+    # The remote-connection client defaults to a pool of one connection, so
+    # overlapping commands queue serially and log "connection pool is full"
+    # warnings. Widen the pool, carrying over the client timeout so a hung
+    # chromedriver command still errors out instead of blocking forever.
+    executor = driver.command_executor
+    client_config = getattr(executor, "_client_config", None)
+    command_timeout = client_config.timeout if client_config else 120
+    executor._conn = urllib3.PoolManager(maxsize=10, timeout=command_timeout)
+
+    return driver
+
+
+def get_driver(show_window=False):
+    """
+    Returns a cached Chrome driver, creating it on first use. The driver is
+    reset (cookies cleared, blank page loaded) between calls, and recreated
+    transparently if the previous session was lost. Chrome startup takes a
+    few seconds, so reusing one instance pays off quickly when scraping
+    multiple URLs.
+    """
+    global _DRIVER
+    if _DRIVER is not None:
+        try:
+            _DRIVER.delete_all_cookies()
+            _DRIVER.get("about:blank")
+        except WebDriverException:
+            # The session was lost (browser crashed or was closed) - recreate
+            try:
+                _DRIVER.quit()
+            except WebDriverException:
+                pass
+            _DRIVER = None
+    if _DRIVER is None:
+        _DRIVER = _create_driver(show_window)
+    return _DRIVER
+
+
+def prewarm_driver(show_window=False):
+    """
+    Starts creating the cached driver in a background thread, hiding the
+    multi-second Chrome startup behind whatever setup work runs next.
+    Returns a Future; call .result() to get the driver before scraping.
+    """
+    return ThreadPoolExecutor(max_workers=1).submit(get_driver, show_window)
+
+
+def close_driver():
+    """
+    Quits the cached driver, if any. Call once after a batch of scrapes.
+    """
+    global _DRIVER
+    if _DRIVER is not None:
+        try:
+            _DRIVER.quit()
+        except WebDriverException:
+            pass
+        _DRIVER = None
+
+
+def _init_worker(show_window=False):
+    """
+    Pool initializer: creates this worker's own cached driver up front.
+    Selenium is not thread-safe, so each worker is a separate process
+    with its own browser.
+    """
+    get_driver(show_window)
+    # Quit this worker's browser when the process exits normally after
+    # pool.close()/join(); otherwise Chrome would outlive the worker
+    atexit.register(close_driver)
+
+
+def _scrape_one(task):
+    """
+    Scrapes a single URL inside a pool worker, reusing the per-process
+    driver. Errors are captured per URL so one bad page does not kill
+    the whole batch.
+    """
+    url, verbose, fields = task
+    # The initializer is skipped for JSON-LD-only batches, so only reuse
+    # a driver if this process actually has one
+    driver = get_driver() if _DRIVER is not None else None
+    try:
+        data = scrape_ozon_product(url, verbose=verbose, fields=fields, driver=driver)
+    except Exception as e:
+        data = {"error": str(e)}
+    data["url"] = url
+    return data
+
+
+def scrape_many(urls, workers=4, verbose=False, fields=ALL_FIELDS, show_window=False):
+    """
+    Scrapes multiple URLs in parallel with a pool of worker processes,
+    each owning a persistent Chrome driver. Yields result dicts (with a
+    "url" key added) as they complete, in arbitrary order.
+    """
+    # JSON-LD-only batches never touch Selenium, so skip driver startup
+    initializer = None if set(fields) <= set(FAST_FIELDS) else _init_worker
+    tasks = [(url, verbose, fields) for url in urls]
+    # Not a `with` block: Pool.__exit__ calls terminate(), which SIGTERMs
+    # the workers before they can quit their browsers. close()/join() lets
+    # each worker exit normally and run its atexit close_driver hook.
+    pool = multiprocessing.Pool(workers, initializer=initializer, initargs=(show_window,) if initializer else ())
+    try:
+        for result in pool.imap_unordered(_scrape_one, tasks):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+async def download_all(urls, concurrency=10):
+    """
+    Downloads all URLs concurrently with aiohttp, limited to `concurrency`
+    requests in flight. Returns {url: bytes}; failed downloads are omitted.
+    Total time is bounded by the slowest download instead of the sum.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(session, url):
+        async with semaphore:
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    return url, await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Timeouts surface as asyncio.TimeoutError, not ClientError;
+                # either way it is just a failed download
+                return url, None
+
+    async with aiohttp.ClientSession(headers=FAST_PATH_HEADERS) as session:
+        results = await asyncio.gather(*(fetch(session, url) for url in urls))
+    return {url: body for url, body in results if body is not None}
+
+
+def download_images(urls, directory, concurrency=10, verbose=False):
+    """
+    Downloads the given image URLs into `directory` (created if missing)
+    and returns the list of written file paths. Files are named after the
+    last path component of each URL.
+    """
+    if not urls:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    if verbose:
+        print(f"Downloading {len(urls)} images to '{directory}'...", file=sys.stderr)
+
+    payloads = asyncio.run(download_all(urls, concurrency=concurrency))
+    paths = []
+    for i, url in enumerate(urls):
+        body = payloads.get(url)
+        if body is None:
+            if verbose:
+                print(f"  - Failed to download: {url}", file=sys.stderr)
+            continue
+        filename = os.path.basename(url.split("?")[0]) or f"image_{i}.jpg"
+        path = os.path.join(directory, filename)
+        with open(path, "wb") as f:
+            f.write(body)
+        paths.append(path)
+    if verbose:
+        print(f"Downloaded {len(paths)} of {len(urls)} images.", file=sys.stderr)
+    return paths
+
+
+# Single-round-trip JS snippets: each find_element/get_attribute pair is a
+# separate HTTP call to chromedriver, so resolving URLs in the browser and
+# returning them in one call is much cheaper
+MAIN_IMAGE_SRC_JS = (
+    "const img = document.querySelector('img.pdp_v6.pdp_v7.b95_3_4-a');"
+    "return img ? (img.currentSrc || img.src) : null;"
+)
+DESCRIPTION_IMAGE_SRCS_JS = (
+    "return Array.from(document.querySelectorAll('#section-description img'),"
+    " e => e.currentSrc || e.src).filter(Boolean);"
+)
+# getElementsByClassName uses the browser's live class index and is orders
+# of magnitude faster than querySelectorAll on Ozon-sized DOMs
+VARIANT_THUMBNAILS_JS = "return Array.from(document.getElementsByClassName('pdp_x7'));"
+# Read the src before clicking: if the gallery handler swaps the image
+# synchronously, reading afterwards would capture the post-click value and
+# the src-change wait would spin on its timeout
+CLICK_VARIANT_AND_GET_SRC_JS = (
+    "const img = document.querySelector('img.pdp_v6.pdp_v7.b95_3_4-a');"
+    "const src = img ? (img.currentSrc || img.src) : null;"
+    "arguments[0].click();"
+    "return src;"
+)
+
+
+def wait_for(driver, locator, timeout=10):
+    """
+    Waits until the element matching `locator` is present in the DOM and
+    returns it. A thin wrapper around WebDriverWait so callers never fall
+    back to fixed sleeps.
+    """
+    return WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located(locator)
+    )
+
+
+def scrape_ozon_product(url, verbose=False, show_window=False, fields=ALL_FIELDS, driver=None):
     """
     Scrapes a product page from Ozon.ru for its price, characteristics,
     description, and all image URLs using a hybrid Selenium + JSON-LD approach.
+
+    `fields` limits what is collected. If everything requested is available
+    from JSON-LD (name, description, price), the page is fetched with plain
+    requests and Selenium is never launched.
+
+    Pass `driver` (e.g. from get_driver()) to reuse one browser across many
+    URLs; it will not be quit. Without it, a fresh driver is created and
+    quit for this call only.
     """
     if verbose:
         print(f"Scraping page: {url}", file=sys.stderr)
 
-    driver = None
-    try:
-        options = Options()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-
-        if not show_window:
-            options.add_argument("--headless")
-            options.add_argument("--window-size=1200,700")
+    # If only JSON-LD fields are requested, try to avoid launching a browser
+    if set(fields) <= set(FAST_FIELDS):
+        data = try_fast_path(url, verbose=verbose)
+        if data is not None:
+            return {key: data.get(key) for key in fields}
+        if verbose:
+            print("Fast path failed. Falling back to Selenium.", file=sys.stderr)
 
-        driver = uc.Chrome(options=options, version_main=142)
-        wait = WebDriverWait(driver, 30)
-        
-        stealth(
-            driver,
-            languages=["ru-RU", "ru"],
-            vendor="Google Inc.",
-            platform="MacIntel",
-            fix_hairline=True,
-        )
+    need_characteristics = "characteristics" in fields
+    need_images = "image_urls" in fields
+    own_driver = driver is None
+    try:
+        if own_driver:
+            driver = _create_driver(show_window)
 
         if verbose:
             print("Loading page with Selenium to bypass anti-bot...", file=sys.stderr)
         driver.get(url)
-        if verbose:
-            print("Waiting for essential page sections (characteristics and description)...", file=sys.stderr)
         try:
-            # Wait for both the characteristics and description sections to be present
-            wait.until(EC.presence_of_element_located((By.ID, "section-characteristics")))
-            wait.until(EC.presence_of_element_located((By.ID, "section-description")))
-            if verbose:
-                print("- Essential sections are present.", file=sys.stderr)
+            # Wait for the product title instead of sleeping a fixed amount
+            wait_for(driver, (By.CSS_SELECTOR, "span.tsHeadline600Large"), timeout=30)
         except Exception as e:
             if verbose:
-                print(f"- Timed out waiting for essential sections: {e}", file=sys.stderr)
+                print(f"- Timed out waiting for the product title: {e}", file=sys.stderr)
+
+        if need_characteristics or need_images:
+            # Characteristics and description live below the fold and are
+            # lazy-loaded; one instant jump to the bottom triggers them, and
+            # the explicit waits below pick up as soon as they appear
+            driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'instant'});")
+
+            if verbose:
+                print("Waiting for essential page sections (characteristics and description)...", file=sys.stderr)
+            try:
+                # Wait only for the sections the requested fields need
+                if need_characteristics:
+                    wait_for(driver, (By.ID, "section-characteristics"), timeout=30)
+                if need_images:
+                    wait_for(driver, (By.ID, "section-description"), timeout=30)
+                if verbose:
+                    print("- Essential sections are present.", file=sys.stderr)
+            except Exception as e:
+                if verbose:
+                    print(f"- Timed out waiting for essential sections: {e}", file=sys.stderr)
 
         
 
@@ -68,146 +538,104 @@ def scrape_ozon_product(url, verbose=False, show_window=False):
             print("Page loaded. Parsing data...", file=sys.stderr)
         
         page_source = driver.page_source
-        soup = BeautifulSoup(page_source, "html.parser")
-        
-        scraped_data = {}
 
         # Step 1: Extract reliable data from JSON-LD
-        script_tag = soup.find("script", {"type": "application/ld+json"})
-        if script_tag:
-            if verbose:
-                print("Found JSON-LD script. Extracting name, description, and price.", file=sys.stderr)
-            json_data = json.loads(script_tag.string)
-            scraped_data["name"] = json_data.get("name")
-            scraped_data["description"] = json_data.get("description").replace("\n\n", " ")
-            offers = json_data.get("offers", [])
-            if isinstance(offers, list) and offers:
-                scraped_data["price"] = offers[0].get("price")
-                scraped_data["price_currency"] = offers[0].get("priceCurrency")
-            elif isinstance(offers, dict):
-                scraped_data["price"] = offers.get("price")
-                scraped_data["price_currency"] = offers.get("priceCurrency")
-        elif verbose:
-            print("!!! Could not find JSON-LD script tag. Name, description, and price will be missing.", file=sys.stderr)
+        scraped_data = parse_json_ld(page_source, verbose=verbose)
 
-        # Step 2: Use Selenium to get characteristics and images, which are not in JSON-LD
-        if verbose:
-            print("Using Selenium to scrape characteristics and images.", file=sys.stderr)
-        
-        try:
-            characteristics_section = driver.find_element(By.ID, "section-characteristics")
-            characteristics_text = characteristics_section.text
-            
-            if verbose:
-                print("- Characteristics section found. Parsing text...", file=sys.stderr)
-
-            lines = characteristics_text.strip().split('\n')
-            
-            # Find the start of the actual characteristics list, skipping headers
-            start_index = 0
-            for i, line in enumerate(lines):
-                if line.strip() == "Добавить к сравнению":
-                    start_index = i + 1
-                    break
-            
-            characteristics_list = []
-            # Process lines in pairs (key, value)
-            # We iterate with a step of 2
-            it = iter(lines[start_index:])
-            for name in it:
-                try:
-                    value = next(it)
-                    characteristics_list.append({"name": name.strip(), "value": value.strip()})
-                except StopIteration:
-                    # This handles the case where there's an odd number of lines
-                    if verbose:
-                        print(f"  - Warning: Characteristic '{name.strip()}' has no value, skipping.", file=sys.stderr)
-            
-            scraped_data["characteristics"] = characteristics_list
-            if verbose:
-                print(f"- Parsed {len(characteristics_list)} characteristics.", file=sys.stderr)
+        # Step 2: Parse characteristics straight from the page HTML - no extra
+        # chromedriver round-trip and no rendered-text splitting
+        if need_characteristics:
+            try:
+                characteristics_soup = BeautifulSoup(page_source, "lxml", parse_only=CHARACTERISTICS_STRAINER)
+                characteristics_list = parse_characteristics(characteristics_soup, verbose=verbose)
+                scraped_data["characteristics"] = characteristics_list
+                if verbose:
+                    print(f"- Parsed {len(characteristics_list)} characteristics.", file=sys.stderr)
+            except Exception as e:
+                if verbose:
+                    print(f"- Could not extract or parse characteristics: {e}", file=sys.stderr)
+                scraped_data["characteristics"] = []
 
-        except Exception as e:
-            if verbose:
-                print(f"- Could not extract or parse characteristics: {e}", file=sys.stderr)
-            scraped_data["characteristics"] = []
-
-        image_urls = []
-        main_image_selector = (By.CSS_SELECTOR, "img.pdp_v6.pdp_v7.b95_3_4-a")
-
-        # Scrape gallery images by clicking variants
-        variant_selectors = driver.find_elements(By.CSS_SELECTOR, "div.pdp_x7")
-        if not variant_selectors and verbose:
-            print("!!! No product variants found. Saving page source for debugging...", file=sys.stderr)
-            page_source_path = "ozon_page_source_no_variants.html"
-            with open(page_source_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            print(f"!!! Page HTML saved to '{page_source_path}'.", file=sys.stderr)
-        
-        if variant_selectors and verbose:
-            print(f"- Found {len(variant_selectors)} product variants. Scraping gallery images...", file=sys.stderr)
-        
-        # The first image is already displayed, so grab it before we start clicking
-        try:
-            initial_image = wait.until(EC.presence_of_element_located(main_image_selector))
-            initial_src = initial_image.get_attribute("src")
-            if initial_src:
-                image_urls.append(initial_src)
-        except Exception as e:
-            if verbose:
-                print(f"- Could not find the initial main image: {e}", file=sys.stderr)
+        # Step 3: Collect gallery and description image URLs, but only when
+        # the caller actually asked for them - the variant-click loop is by
+        # far the most expensive part of the scrape
+        if need_images:
+            seen_urls = set()
+            image_urls = []
 
-        # Loop through the rest of the variants, skipping the first one which is already loaded
-        for i, selector in enumerate(variant_selectors[1:], start=1):
+            def add_image_url(image_url):
+                # Deduplicate on insert, keeping first-seen order, instead of
+                # rebuilding the whole list at the end
+                if image_url and image_url not in seen_urls:
+                    seen_urls.add(image_url)
+                    image_urls.append(image_url)
+            main_image_selector = (By.CSS_SELECTOR, "img.pdp_v6.pdp_v7.b95_3_4-a")
+
+            # Scrape gallery images by clicking variants
+            variant_selectors = driver.execute_script(VARIANT_THUMBNAILS_JS)
+            if not variant_selectors and verbose:
+                print("!!! No product variants found. Saving page source for debugging...", file=sys.stderr)
+                page_source_path = "ozon_page_source_no_variants.html"
+                with open(page_source_path, "w", encoding="utf-8") as f:
+                    f.write(driver.page_source)
+                print(f"!!! Page HTML saved to '{page_source_path}'.", file=sys.stderr)
+
+            if variant_selectors and verbose:
+                print(f"- Found {len(variant_selectors)} product variants. Scraping gallery images...", file=sys.stderr)
+
+            # The first image is already displayed, so grab it before we start clicking
             try:
-                # Get the 'src' before clicking, to see if it changes
-                old_src = driver.find_element(*main_image_selector).get_attribute("src")
-
-                # Click the thumbnail
-                actions = ActionChains(driver)
-                actions.move_to_element(selector).click().perform()
-
-                # Wait for the 'src' attribute to become different from the old one
-                WebDriverWait(driver, 10).until(
-                    lambda d: d.find_element(*main_image_selector).get_attribute("src") != old_src
-                )
-                
-                # Get the new 'src' after it has changed
-                new_src = driver.find_element(*main_image_selector).get_attribute("src")
-                if new_src:
-                    image_urls.append(new_src)
+                wait_for(driver, main_image_selector, timeout=30)
+                initial_src = driver.execute_script(MAIN_IMAGE_SRC_JS)
+                if initial_src:
+                    add_image_url(initial_src)
+            except Exception as e:
+                if verbose:
+                    print(f"- Could not find the initial main image: {e}", file=sys.stderr)
+
+            # Loop through the rest of the variants, skipping the first one which is already loaded
+            for i, selector in enumerate(variant_selectors[1:], start=1):
+                try:
+                    # One call both clicks the thumbnail and returns the current
+                    # (pre-update) src, replacing a separate read plus an
+                    # ActionChains click sequence
+                    old_src = driver.execute_script(CLICK_VARIANT_AND_GET_SRC_JS, selector)
+
+                    # Poll until the src changes; the wait itself yields the new
+                    # value, so no follow-up read is needed
+                    new_src = WebDriverWait(driver, 10).until(
+                        lambda d: (src := d.execute_script(MAIN_IMAGE_SRC_JS)) != old_src and src
+                    )
+                    add_image_url(new_src)
                     if verbose:
                         print(f"  - Extracted new image URL for variant {i+1}: {new_src}", file=sys.stderr)
 
+                except Exception as e:
+                    if verbose:
+                        # A timeout here usually just means the click didn't change the image (e.g., clicking the same color)
+                        print(f"  - Note: Image may not have changed for variant {i+1}. Skipping.", file=sys.stderr)
+
+            # Scrape description images: resolve all the src URLs in one JS call
+            try:
+                description_srcs = driver.execute_script(DESCRIPTION_IMAGE_SRCS_JS)
+                if description_srcs and verbose:
+                    print(f"- Found {len(description_srcs)} images in description. Scraping URLs...", file=sys.stderr)
+                for description_src in description_srcs:
+                    add_image_url(description_src)
             except Exception as e:
                 if verbose:
-                    # A timeout here usually just means the click didn't change the image (e.g., clicking the same color)
-                    print(f"  - Note: Image may not have changed for variant {i+1}. Skipping.", file=sys.stderr)
+                     print(f"- Could not find or process description images: {e}", file=sys.stderr)
 
-        # Scrape description images
-        try:
-            description_section = driver.find_element(By.ID, "section-description")
-            description_images = description_section.find_elements(By.TAG_NAME, "img")
-            if description_images and verbose:
-                print(f"- Found {len(description_images)} images in description. Scraping URLs...", file=sys.stderr)
-            for img in description_images:
-                image_url = img.get_attribute("src")
-                if image_url:
-                    image_urls.append(image_url)
-        except Exception as e:
+            scraped_data["image_urls"] = image_urls
             if verbose:
-                 print(f"- Could not find or process description images: {e}", file=sys.stderr)
-
+                print(f"Total unique images found: {len(image_urls)}", file=sys.stderr)
 
-        # Remove duplicates while preserving order
-        scraped_data["image_urls"] = list(dict.fromkeys(image_urls))
-        if verbose:
-            print(f"Total unique images found: {len(scraped_data['image_urls'])}", file=sys.stderr)
-
-        return scraped_data
+        # Return exactly the requested fields so the output schema is the
+        # same whether the fast path or the browser produced the data
+        return {key: scraped_data.get(key) for key in fields}
 
     finally:
-        if driver:
+        if own_driver and driver:
             driver.quit()
         if verbose:
             print("Scraping finished.", file=sys.stderr)
@@ -231,7 +659,7 @@ Example:
   ./scraper.py https://www.ozon.ru/product/some-product-12345/ -v
 """,
     )
-    parser.add_argument("url", help="The URL of the product page to scrape.")
+    parser.add_argument("urls", nargs="+", help="One or more URLs of product pages to scrape.")
     parser.add_argument(
         "-v",
         "--verbose",
@@ -243,14 +671,56 @@ Example:
         action="store_true",
         help="Show the browser window (useful for debugging).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of parallel browser processes when scraping multiple URLs.",
+    )
+    parser.add_argument(
+        "--download-images",
+        metavar="DIR",
+        help="Download all scraped image URLs into this directory (concurrently).",
+    )
+    parser.add_argument(
+        "--fields",
+        default=",".join(ALL_FIELDS),
+        help="Comma-separated list of fields to scrape. If only JSON-LD fields\n"
+             "(name, description, price, price_currency) are requested, the page\n"
+             "is fetched without launching a browser.",
+    )
     args = parser.parse_args()
 
     try:
         # The browser window is shown if either verbose mode is on or the show-window flag is set
         should_show_window = args.verbose or args.show_window
-        data = scrape_ozon_product(args.url, args.verbose, show_window=should_show_window)
-        if data:
-            print(json.dumps(data, indent=2, ensure_ascii=False))
+        fields = tuple(f.strip() for f in args.fields.split(",") if f.strip())
+
+        # Start Chrome in the background while the remaining setup runs, so
+        # its startup cost overlaps with ours instead of adding to it
+        prewarm = None
+        if len(args.urls) == 1 and not set(fields) <= set(FAST_FIELDS):
+            prewarm = prewarm_driver(should_show_window)
+
+        if args.download_images:
+            os.makedirs(args.download_images, exist_ok=True)
+
+        if len(args.urls) == 1:
+            driver = prewarm.result() if prewarm else None
+            data = scrape_ozon_product(args.urls[0], args.verbose, show_window=should_show_window, fields=fields, driver=driver)
+            if data:
+                if args.download_images:
+                    download_images(data.get("image_urls") or [], args.download_images, verbose=args.verbose)
+                sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+        else:
+            # Multiple URLs: scrape in parallel and stream results as JSON Lines
+            for data in scrape_many(args.urls, workers=args.workers, verbose=args.verbose, fields=fields, show_window=should_show_window):
+                if args.download_images:
+                    download_images(data.get("image_urls") or [], args.download_images, verbose=args.verbose)
+                sys.stdout.buffer.write(orjson.dumps(data) + b"\n")
+                sys.stdout.buffer.flush()
     except Exception as e:
         print(f"A critical error occurred: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        close_driver()